@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+
+import time
+
+from host import HostClient
+
+wb = HostClient()
+wb.open()
+
+# # #
+
+def display_update_sel(values):
+    # 3 accesses per digit: sel/value/write
+    for sel, value in enumerate(values):
+        wb.regs.display_sel.write(sel)
+        wb.regs.display_value.write(value)
+        wb.regs.display_write.write(1)
+
+def display_update_packed(values):
+    # 2 accesses for all digits: digits/commit
+    digits = 0
+    for i, value in enumerate(values):
+        digits |= (value & 0xf) << (4*i)
+    wb.regs.display_digits.write(digits)
+    wb.regs.display_commit.write(1)
+
+def bench(name, update, n=100):
+    start = time.time()
+    for i in range(n):
+        update([(i + j)%10 for j in range(6)])
+    duration = time.time() - start
+    print("{:8s}: {:8.1f} updates/s ({:.3f}ms/update)".format(name, n/duration, 1000*duration/n))
+    return n/duration
+
+print("Benchmarking SevenSegmentDisplay updates...")
+sel    = bench("sel",    display_update_sel)
+packed = bench("packed", display_update_packed)
+print("speedup: {:.1f}x".format(packed/sel))
+
+# # #
+
+wb.close()
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+
+import time
+
+from host import HostClient
+
+wb = HostClient()
+wb.open()
+
+# # #
+
+def bench(name, read, n=256, iterations=4):
+    start = time.time()
+    for i in range(iterations):
+        read(wb.bases.identifier_mem, n)
+    duration = (time.time() - start)/iterations
+    print("{:8s}: {:8.3f}ms for {} words ({:8.1f} words/s)".format(name, 1000*duration, n, n/duration))
+    return duration
+
+print("Benchmarking identifier reads...")
+words = bench("per-word", wb.read_words)
+burst = bench("burst",    wb.read_burst)
+print("speedup: {:.1f}x".format(words/burst))
+
+# # #
+
+wb.close()
@@ -0,0 +1,165 @@
+import os
+import json
+import hashlib
+
+from litex import RemoteClient
+
+# Host helpers shared by the test scripts.
+#
+# - Burst reads: a single bridge request for N consecutive words (instead of one
+#   request per word).
+# - Cache of immutable data (identifier, DNA): stored in host_cache.json and keyed
+#   on the build (bitstream if available, csr.csv otherwise) so that repeated runs
+#   don't re-read it from the board.
+# - Shadow registers: write-through cache of the storage registers (see
+#   ShadowRegisters).
+
+bitstream  = "../build/gateware/top.bit"
+csr_csv    = "csr.csv"
+cache_file = "host_cache.json"
+
+# Build key ----------------------------------------------------------------------------------------
+
+def build_key():
+    h = hashlib.sha1()
+    for filename in [bitstream, csr_csv]:
+        if os.path.exists(filename):
+            with open(filename, "rb") as f:
+                h.update(f.read())
+            break
+    return h.hexdigest()
+
+# ShadowRegisters ----------------------------------------------------------------------------------
+
+class ShadowRegister:
+    def __init__(self, reg, cached, on_write=None):
+        self.reg      = reg
+        self.cached   = cached
+        self.on_write = on_write
+        self.value    = None
+        self.hits     = 0
+        self.skips    = 0
+
+    def read(self):
+        if not self.cached:
+            return self.reg.read()
+        if self.value is None:
+            self.value = self.reg.read()
+        else:
+            self.hits += 1
+        return self.value
+
+    def write(self, value):
+        if self.cached and (value == self.value):
+            self.skips += 1
+            return
+        self.reg.write(value)
+        if self.cached:
+            self.value = value
+        if self.on_write is not None:
+            self.on_write()
+
+    def invalidate(self):
+        self.value = None
+
+
+class ShadowRegisters:
+    """Write-through shadow of the storage registers
+
+    Registers are cached based on csr.csv metadata: "ro" (CSRStatus) registers are
+    always read from the hardware, "rw" registers are only written by the host so
+    they are cached: reads are served locally and writes of unchanged values are
+    skipped. "rw" registers with a side effect on write (CSR strobes, commands) are
+    not cached: they are selected with the uncached suffixes/names.
+    """
+    uncached_suffixes = ["_write", "_commit", "_start", "_control", "_reset", "_pending"]
+    reset_registers   = ["ctrl_reset"]
+
+    def __init__(self, regs, uncached=[]):
+        self._regs = {}
+        for name, reg in regs.__dict__.items():
+            cached = (reg.mode == "rw")
+            cached &= not any(name.endswith(suffix) for suffix in self.uncached_suffixes)
+            cached &= name not in uncached
+            on_write = self.invalidate if name in self.reset_registers else None
+            self._regs[name] = ShadowRegister(reg, cached, on_write)
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__["_regs"][name]
+        except KeyError:
+            raise AttributeError("No such register " + name)
+
+    def invalidate(self):
+        for reg in self._regs.values():
+            reg.invalidate()
+
+    def stats(self):
+        hits  = sum(reg.hits  for reg in self._regs.values())
+        skips = sum(reg.skips for reg in self._regs.values())
+        return {"hits": hits, "skips": skips}
+
+# HostClient ---------------------------------------------------------------------------------------
+
+class HostClient(RemoteClient):
+    # Max number of words per bridge request (length is a byte on the UART bridge).
+    burst_max = 255
+
+    def __init__(self, *args, **kwargs):
+        RemoteClient.__init__(self, *args, **kwargs)
+        self.cache  = self._load_cache()
+        self.shadow = ShadowRegisters(self.regs)
+
+    # Burst ----------------------------------------------------------------------------------------
+
+    def read_burst(self, addr, n):
+        datas = []
+        while len(datas) < n:
+            length = min(n - len(datas), self.burst_max)
+            r = self.read(addr + 4*len(datas), length)
+            datas += r if isinstance(r, list) else [r]
+        return datas
+
+    def read_words(self, addr, n):
+        return [self.read(addr + 4*i) for i in range(n)]
+
+    # Cache ----------------------------------------------------------------------------------------
+
+    def _load_cache(self):
+        key = build_key()
+        try:
+            with open(cache_file, "r") as f:
+                cache = json.load(f)
+            if cache.get("build") == key:
+                return cache
+        except (IOError, ValueError):
+            pass
+        return {"build": key}
+
+    def _save_cache(self):
+        with open(cache_file, "w") as f:
+            json.dump(self.cache, f, indent=4)
+
+    def cached(self, name, read):
+        if name not in self.cache:
+            self.cache[name] = read()
+            self._save_cache()
+        return self.cache[name]
+
+    # Identifier / DNA -----------------------------------------------------------------------------
+
+    def _read_identifier(self, chunk=64):
+        fpga_id = ""
+        for i in range(0, 256, chunk):
+            for data in self.read_burst(self.bases.identifier_mem + 4*i, chunk):
+                c = chr(data & 0xff)
+                if c == "\0":
+                    return fpga_id
+                fpga_id += c
+        return fpga_id
+
+    def read_identifier(self):
+        return self.cached("identifier", self._read_identifier)
+
+    def read_dna(self):
+        return self.cached("dna", self.regs.dna_id.read)
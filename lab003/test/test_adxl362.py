@@ -2,16 +2,19 @@
 
 import time
 
-from litex import RemoteClient
+from host import HostClient
 
-wb = RemoteClient()
+wb = HostClient()
 wb.open()
 
 # # #
 
 class ADXL362SPI:
-    def __init__(self, regs):
-        self.regs = regs
+    fifo_depth = 64
+
+    def __init__(self, wb):
+        self.wb   = wb
+        self.regs = wb.regs
 
     def write(self, addr, byte):
         val = (0b00001010 << 16) | ((addr & 0xff) << 8) | (byte & 0xff)
@@ -30,10 +33,29 @@ class ADXL362SPI:
             pass
         return self.regs.adxl362_miso.read() & 0xff
 
+    def burst(self, addr, length, we):
+        self.regs.adxl362_burst_control.write((we << 16) | ((length & 0xff) << 8) | (addr & 0xff))
+        while ((self.regs.adxl362_burst_status.read() & 0x1) == 0):
+            pass
+
+    def write_burst(self, addr, datas):
+        for i in range(0, len(datas), self.fifo_depth):
+            chunk = datas[i:i + self.fifo_depth]
+            self.wb.write(self.wb.mems.adxl362_fifo.base, [d & 0xff for d in chunk])
+            self.burst(addr + i, len(chunk), we=1)
+
+    def read_burst(self, addr, n):
+        datas = []
+        for i in range(0, n, self.fifo_depth):
+            length = min(n - i, self.fifo_depth)
+            self.burst(addr + i, length, we=0)
+            datas += [d & 0xff for d in self.wb.read(self.wb.mems.adxl362_fifo.base, length)]
+        return datas
+
 
-adxl362 = ADXL362SPI(wb.regs)
-for i in range(64):
-	print("reg 0x{:02x}: 0x{:02x}".format(i, adxl362.read(i)))
+adxl362 = ADXL362SPI(wb)
+for i, value in enumerate(adxl362.read_burst(0, 64)):
+	print("reg 0x{:02x}: 0x{:02x}".format(i, value))
 
 # # #
 
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+
+import time
+
+from host import HostClient
+
+wb = HostClient()
+wb.open()
+
+# # #
+
+sys_clk_freq = 100e6
+sample_freq  = 100
+
+def adxl362_write(addr, byte):
+    wb.write(wb.mems.adxl362_fifo.base, byte)
+    wb.regs.adxl362_burst_control.write((1 << 16) | (1 << 8) | addr)
+    while ((wb.regs.adxl362_burst_status.read() & 0x1) == 0):
+        pass
+
+def read_samples():
+    level = wb.regs.adxl362_sample_level.read()
+    if level == 0:
+        return []
+    datas = wb.read(wb.mems.adxl362_samples.base, 4*level)
+    samples = []
+    for i in range(level):
+        timestamp, x, y, z = datas[4*i:4*(i+1)]
+        samples.append((timestamp, *[v - (1 << 32) if v & 0x80000000 else v for v in (x, y, z)]))
+    return samples
+
+# Enable measurement mode (POWER_CTL)
+adxl362_write(0x2d, 0x02)
+
+# Start sampling
+print("Sampling ADXL362 at {}Hz...".format(sample_freq))
+wb.regs.adxl362_sample_period.write(int(sys_clk_freq/sample_freq))
+try:
+    while True:
+        samples = read_samples()
+        for timestamp, x, y, z in samples:
+            print("{:10d}: x: {:5d} y: {:5d} z: {:5d}".format(timestamp, x, y, z))
+        time.sleep(0.5)
+except KeyboardInterrupt:
+    pass
+wb.regs.adxl362_sample_period.write(0)
+
+# # #
+
+wb.close()
@@ -3,9 +3,9 @@
 import time
 import random
 
-from litex import RemoteClient
+from host import HostClient
 
-wb = RemoteClient()
+wb = HostClient()
 wb.open()
 
 # # #
@@ -3,9 +3,9 @@
 import time
 import datetime
 
-from litex import RemoteClient
+from host import HostClient
 
-wb = RemoteClient()
+wb = HostClient()
 wb.open()
 
 # # #
@@ -15,13 +15,18 @@ def display_write(sel, value):
     wb.regs.display_value.write(value)
     wb.regs.display_write.write(1)
 
+def display_write_all(values):
+    digits = 0
+    for i, value in enumerate(values):
+        digits |= (value & 0xf) << (4*i)
+    wb.regs.display_digits.write(digits)
+    wb.regs.display_commit.write(1)
+
 def display_time(hour, minute, second):
-    display_write(0, second%10)
-    display_write(1, (second//10)%10)
-    display_write(2, minute%10)
-    display_write(3, (minute//10)%10)
-    display_write(4, hour%10)
-    display_write(5, (hour//10)%10)
+    display_write_all([
+        second%10, (second//10)%10,
+        minute%10, (minute//10)%10,
+        hour%10,   (hour//10)%10])
 
 print("Testing SevenSegmentDisplay...")
 while True:
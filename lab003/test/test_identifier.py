@@ -1,20 +1,15 @@
 #!/usr/bin/env python3
 
-from litex import RemoteClient
+from host import HostClient
 
-wb = RemoteClient()
+wb = HostClient()
 wb.open()
 
 # # #
 
-# get identifier
-fpga_id = ""
-for i in range(256):
-    c = chr(wb.read(wb.bases.identifier_mem + 4*i) & 0xff)
-    fpga_id += c
-    if c == "\0":
-        break
-print("fpga_id: " + fpga_id)
+# get identifier (burst read, cached per build)
+print("fpga_id: " + wb.read_identifier())
+print("dna: 0x{:015x}".format(wb.read_dna()))
 
 # # #
 
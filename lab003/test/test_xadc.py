@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
-from litex import RemoteClient
+from host import HostClient
 
-wb = RemoteClient()
+wb = HostClient()
 wb.open()
 regs = wb.regs
 
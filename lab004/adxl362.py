@@ -0,0 +1,298 @@
+from migen import *
+from migen.genlib.fifo import SyncFIFO, SyncFIFOBuffered
+from migen.genlib.record import Record
+
+from litex.soc.interconnect.csr import *
+from litex.soc.interconnect import wishbone
+from litex.soc.cores.spi import SPIMaster
+
+# ADXL362 datasheet: see datasheet directory or https://www.analog.com/media/en/technical-documentation/data-sheets/ADXL362.pdf
+#
+# Register access (SPI mode 0):
+#  _____                                                      _____
+#       |____________________________________________________|       cs_n
+#        <- cmd -><- addr -><- data 0 -><- data 1 -> ... ->
+#
+# cmd: 0x0a: write register(s), 0x0b: read register(s).
+# The address is auto-incremented by the ADXL362 for each data byte while
+# cs_n is kept low, allowing multi-byte (burst) accesses.
+
+_spi_pads_layout = [("clk", 1), ("cs_n", 1), ("mosi", 1), ("miso", 1)]
+
+# _SPIBurst ----------------------------------------------------------------------------------------
+
+class _SPIBurst(Module):
+    def __init__(self, pads, sys_clk_freq, spi_clk_freq):
+        # Module's interface
+        self.start    = Signal()  # input
+        self.we       = Signal()  # input
+        self.addr     = Signal(8) # input
+        self.length   = Signal(8) # input (number of data bytes)
+        self.done     = Signal()  # output
+
+        self.tx_data  = Signal(8) # input
+        self.tx_valid = Signal()  # input
+        self.tx_ready = Signal()  # output
+
+        self.rx_data  = Signal(8) # output
+        self.rx_valid = Signal()  # output
+
+        # # #
+
+        # SPI clock generation: strobe every half SPI clock period
+        half_period = max(int(sys_clk_freq/(2*spi_clk_freq)), 1)
+        strobe      = Signal()
+        strobe_cnt  = Signal(max=half_period + 1)
+        self.comb += strobe.eq(strobe_cnt == (half_period - 1))
+        self.sync += [
+            strobe_cnt.eq(strobe_cnt + 1),
+            If(strobe,
+                strobe_cnt.eq(0)
+            )
+        ]
+
+        # Shift register: mosi is shifted out on falling edges, miso sampled on
+        # rising edges and shifted in on falling edges.
+        sr         = Signal(8)
+        miso       = Signal()
+        we         = Signal()
+        addr       = Signal(8)
+        length     = Signal(8)
+        bit_count  = Signal(3)
+        byte_count = Signal(9) # cmd + addr + data bytes
+        last_bit   = Signal()
+        last_byte  = Signal()
+        self.comb += [
+            last_bit.eq(bit_count == 7),
+            last_byte.eq(byte_count == (length + 1)),
+            pads.mosi.eq(sr[7]),
+            self.rx_data.eq(Cat(miso, sr[:7]))
+        ]
+
+        self.submodules.fsm = fsm = FSM(reset_state="IDLE")
+        fsm.act("IDLE",
+            self.done.eq(1),
+            If(self.start,
+                NextValue(we, self.we),
+                NextValue(addr, self.addr),
+                NextValue(length, self.length),
+                NextValue(sr, Mux(self.we, 0x0a, 0x0b)),
+                NextValue(bit_count, 0),
+                NextValue(byte_count, 0),
+                NextState("SETUP")
+            )
+        )
+        fsm.act("SETUP",
+            If(strobe,
+                NextValue(miso, pads.miso),
+                NextState("HIGH")
+            )
+        )
+        fsm.act("HIGH",
+            pads.clk.eq(1),
+            If(strobe,
+                NextValue(sr, Cat(miso, sr[:7])),
+                NextValue(bit_count, bit_count + 1),
+                If(last_bit,
+                    # Received data bytes are forwarded on reads
+                    self.rx_valid.eq(~we & (byte_count >= 2)),
+                    NextValue(byte_count, byte_count + 1),
+                    If(last_byte,
+                        NextState("HOLD")
+                    ).Else(
+                        # Load next byte: addr, then data (from tx on writes)
+                        If(byte_count == 0,
+                            NextValue(sr, addr)
+                        ).Elif(we,
+                            self.tx_ready.eq(1),
+                            NextValue(sr, Mux(self.tx_valid, self.tx_data, 0))
+                        ).Else(
+                            NextValue(sr, 0)
+                        ),
+                        NextState("LOW")
+                    )
+                ).Else(
+                    NextState("LOW")
+                )
+            )
+        )
+        fsm.act("LOW",
+            If(strobe,
+                NextValue(miso, pads.miso),
+                NextState("HIGH")
+            )
+        )
+        fsm.act("HOLD",
+            If(strobe,
+                NextState("IDLE")
+            )
+        )
+        self.comb += pads.cs_n.eq(fsm.ongoing("IDLE"))
+
+# ADXL362 ------------------------------------------------------------------------------------------
+
+class ADXL362(SPIMaster):
+    def __init__(self, pads, sys_clk_freq, spi_clk_freq, fifo_depth=64, sample_fifo_depth=256):
+        # SPIMaster interface (single transaction of up to 32-bit)
+        spi_pads = Record(_spi_pads_layout)
+        SPIMaster.__init__(self, spi_pads,
+            data_width   = 32,
+            sys_clk_freq = sys_clk_freq,
+            spi_clk_freq = spi_clk_freq)
+
+        # Burst interface
+        # burst_control: [7:0] addr, [15:8] length (number of data bytes), [16] we.
+        # Writing burst_control starts the burst access. Data bytes are read from (on
+        # reads) or written to (on writes) the FIFOs through the bus interface: each
+        # bus read pops a byte from the RX FIFO, each bus write pushes a byte to the
+        # TX FIFO, regardless of the address.
+        # burst_status: [0] done, [15:8] RX FIFO level.
+        self.burst_control = CSRStorage(17)
+        self.burst_status  = CSRStatus(16)
+        self.bus = bus = wishbone.Interface()
+
+        # Sampling interface
+        # sample_period: XDATA/YDATA/ZDATA are read every sample_period sys_clk cycles
+        # (0: disabled). Samples are timestamped (sys_clk cycles) and pushed to the
+        # sample FIFO. Each sample is read through the sample bus interface as 4
+        # words: timestamp, x, y, z (reading z pops the sample).
+        # sample_level: number of samples in the sample FIFO.
+        self.sample_period = CSRStorage(32)
+        self.sample_level  = CSRStatus(bits_for(sample_fifo_depth))
+        self.sample_bus = sample_bus = wishbone.Interface()
+
+        # # #
+
+        burst_pads = Record(_spi_pads_layout)
+        burst      = _SPIBurst(burst_pads, sys_clk_freq, spi_clk_freq)
+        self.submodules.burst = burst
+
+        # RX/TX FIFOs (RX FIFO is flushed at the start of each burst read)
+        rx_fifo = ResetInserter()(SyncFIFO(8, fifo_depth))
+        tx_fifo = SyncFIFO(8, fifo_depth)
+        self.submodules.rx_fifo = rx_fifo
+        self.submodules.tx_fifo = tx_fifo
+
+        # Sample FIFO: timestamp, x, y, z
+        sample_fifo = SyncFIFOBuffered(32 + 3*16, sample_fifo_depth)
+        self.submodules.sample_fifo = sample_fifo
+
+        # Burst arbitration: burst requests from the CSR interface are kept pending
+        # while the sequencer is reading a sample.
+        host_pending   = Signal()
+        sample_pending = Signal()
+        sampling       = Signal() # Burst in progress is a sample burst
+        sample_start   = Signal()
+        host_start     = Signal()
+        self.comb += [
+            host_start.eq(burst.done & host_pending & ~sample_start),
+            sample_start.eq(burst.done & sample_pending),
+            burst.start.eq(host_start | sample_start),
+            If(sample_start,
+                burst.addr.eq(0x0e), # XDATA_L
+                burst.length.eq(6),  # XDATA_L/H, YDATA_L/H, ZDATA_L/H
+                burst.we.eq(0)
+            ).Else(
+                burst.addr.eq(self.burst_control.storage[0:8]),
+                burst.length.eq(self.burst_control.storage[8:16]),
+                burst.we.eq(self.burst_control.storage[16])
+            ),
+            rx_fifo.reset.eq(host_start & ~burst.we),
+
+            rx_fifo.din.eq(burst.rx_data),
+            rx_fifo.we.eq(burst.rx_valid & ~sampling),
+            burst.tx_data.eq(tx_fifo.dout),
+            burst.tx_valid.eq(tx_fifo.readable),
+            tx_fifo.re.eq(burst.tx_ready),
+
+            self.burst_status.status[0].eq(~host_pending & (burst.done | sampling)),
+            self.burst_status.status[8:16].eq(rx_fifo.level),
+        ]
+        self.sync += [
+            If(self.burst_control.re,
+                host_pending.eq(1)
+            ).Elif(host_start,
+                host_pending.eq(0)
+            ),
+            If(burst.start,
+                sampling.eq(sample_start)
+            )
+        ]
+
+        # Sequencer: timebase, timestamp and sample capture
+        timer       = Signal(32)
+        timestamp   = Signal(32)
+        sample_ts   = Signal(32)
+        sample      = Signal(3*16)
+        sample_busy = Signal()
+        self.sync += [
+            timestamp.eq(timestamp + 1),
+            If(self.sample_period.storage == 0,
+                timer.eq(0),
+                sample_pending.eq(0)
+            ).Else(
+                timer.eq(timer + 1),
+                If(timer >= (self.sample_period.storage - 1),
+                    timer.eq(0),
+                    sample_pending.eq(1)
+                ).Elif(sample_start,
+                    sample_pending.eq(0)
+                )
+            ),
+            If(sampling & burst.rx_valid,
+                sample.eq(Cat(sample[8:], burst.rx_data))
+            ),
+            If(sample_busy & sampling & burst.done,
+                sample_busy.eq(0)
+            ),
+            If(sample_start,
+                sample_ts.eq(timestamp),
+                sample_busy.eq(1)
+            )
+        ]
+        # Push sample at the end of the sample burst (dropped if FIFO is full)
+        self.comb += [
+            sample_fifo.din.eq(Cat(sample_ts, sample)),
+            sample_fifo.we.eq(sample_busy & sampling & burst.done),
+            self.sample_level.status.eq(sample_fifo.level)
+        ]
+
+        # Bus interface to the FIFOs
+        self.comb += [
+            rx_fifo.re.eq(bus.cyc & bus.stb & ~bus.we & ~bus.ack),
+            tx_fifo.din.eq(bus.dat_w[0:8]),
+            tx_fifo.we.eq(bus.cyc & bus.stb & bus.we & ~bus.ack),
+        ]
+        self.sync += [
+            bus.ack.eq(bus.cyc & bus.stb & ~bus.ack),
+            bus.dat_r.eq(rx_fifo.dout)
+        ]
+
+        # Sample bus interface to the sample FIFO (x/y/z are sign-extended)
+        sample_field = sample_bus.adr[0:2]
+        self.comb += sample_fifo.re.eq(
+            sample_bus.cyc & sample_bus.stb & ~sample_bus.we & ~sample_bus.ack & (sample_field == 3))
+        self.sync += [
+            sample_bus.ack.eq(sample_bus.cyc & sample_bus.stb & ~sample_bus.ack),
+            Case(sample_field, {
+                0 : sample_bus.dat_r.eq(sample_fifo.dout[0:32]),
+                1 : sample_bus.dat_r.eq(Cat(sample_fifo.dout[32:48], Replicate(sample_fifo.dout[47], 16))),
+                2 : sample_bus.dat_r.eq(Cat(sample_fifo.dout[48:64], Replicate(sample_fifo.dout[63], 16))),
+                3 : sample_bus.dat_r.eq(Cat(sample_fifo.dout[64:80], Replicate(sample_fifo.dout[79], 16))),
+            })
+        ]
+
+        # Pads: burst interface has the pads when active, SPIMaster otherwise
+        self.comb += [
+            If(~burst.done,
+                pads.clk.eq(burst_pads.clk),
+                pads.cs_n.eq(burst_pads.cs_n),
+                pads.mosi.eq(burst_pads.mosi)
+            ).Else(
+                pads.clk.eq(spi_pads.clk),
+                pads.cs_n.eq(spi_pads.cs_n),
+                pads.mosi.eq(spi_pads.mosi)
+            ),
+            spi_pads.miso.eq(pads.miso),
+            burst_pads.miso.eq(pads.miso)
+        ]
@@ -8,12 +8,13 @@ from litex.build.generic_platform import *
 from litex.build.xilinx import XilinxPlatform
 
 from litex.soc.integration.soc_core import *
+from litex.soc.integration.soc import SoCRegion
 from litex.soc.integration.builder import *
 from litex.soc.cores import dna, xadc
-from litex.soc.cores.spi import SPIMaster
 
 from ios import Led, RGBLed, Button, Switch
 from display import SevenSegmentDisplay
+from adxl362 import ADXL362
 
 # IOs ----------------------------------------------------------------------------------------------
 
@@ -146,11 +147,14 @@ class BaseSoC(SoCCore):
         self.add_csr("rgbled")
 
         # Accelerometer
-        self.submodules.adxl362 = SPIMaster(platform.request("adxl362_spi"),
-            data_width   = 32,
+        self.submodules.adxl362 = ADXL362(platform.request("adxl362_spi"),
             sys_clk_freq = sys_clk_freq,
             spi_clk_freq = 1e6)
         self.add_csr("adxl362")
+        self.bus.add_slave("adxl362_fifo", self.adxl362.bus,
+            SoCRegion(origin=0xa0000000, size=0x1000, cached=False))
+        self.bus.add_slave("adxl362_samples", self.adxl362.sample_bus,
+            SoCRegion(origin=0xa0001000, size=0x1000, cached=False))
 
         # SevenSegmentDisplay
         self.submodules.display = SevenSegmentDisplay(sys_clk_freq)
@@ -100,10 +100,17 @@ class _SevenSegmentDisplay(Module):
 
 class SevenSegmentDisplay(Module, AutoCSR):
     def __init__(self, sys_clk_freq):
+        # Per digit interface (sel/value/write: 3 accesses per digit)
         self.sel   = CSRStorage(4)
         self.value = CSRStorage(4)
         self.write = CSR()
 
+        # Packed interface (digits/commit: 1 access for all digits + 1 commit)
+        # digits[4*n:4*(n+1)] is the value of digit n. digits is only a shadow
+        # register: displayed values are updated all together on commit.
+        self.digits = CSRStorage(4*6)
+        self.commit = CSR()
+
         self.cs      = Signal(6) # output
         self.abcdefg = Signal(7) # output
 
@@ -131,6 +138,11 @@ class SevenSegmentDisplay(Module, AutoCSR):
                     5 : display.values[5].eq(self.value.storage),
                     }
                 )
+            ),
+            # When CPU access commit CSR
+            If(self.commit.re,
+                # Update all values at once from digits register
+                [display.values[i].eq(self.digits.storage[4*i:4*(i+1)]) for i in range(6)]
             )
         ]
 
@@ -6,6 +6,7 @@
 #include <uart.h>
 #include <console.h>
 #include <generated/csr.h>
+#include <generated/mem.h>
 
 static char *readstr(void)
 {
@@ -73,6 +74,7 @@ static void help(void)
 	puts("reboot                          - reboot CPU");
 	puts("display                         - display test");
 	puts("led                             - led test");
+	puts("accel                           - accelerometer sampling test");
 }
 
 static void reboot(void)
@@ -83,12 +85,14 @@ static void reboot(void)
 static void display_test(void)
 {
 	int i;
+	unsigned int digits;
 	printf("display_test...\n");
-	for(i=0; i<6; i++) {
-		display_sel_write(i);
-		display_value_write(i);
-		display_write_write(1);
-	}
+	/* pack all digits (4-bit each) and commit them at once */
+	digits = 0;
+	for(i=0; i<6; i++)
+		digits |= i << (4*i);
+	display_digits_write(digits);
+	display_commit_write(1);
 }
 
 static void led_test(void)
@@ -101,6 +105,32 @@ static void led_test(void)
 	}
 }
 
+static void accel_test(void)
+{
+	int i, n;
+	unsigned int timestamp;
+	int x, y, z;
+	volatile unsigned int *fifo = (unsigned int *)ADXL362_FIFO_BASE;
+	volatile unsigned int *samples = (unsigned int *)ADXL362_SAMPLES_BASE;
+	printf("accel_test...\n");
+	/* enable measurement mode (POWER_CTL) */
+	fifo[0] = 0x02;
+	adxl362_burst_control_write((1 << 16) | (1 << 8) | 0x2d);
+	while((adxl362_burst_status_read() & 0x1) == 0);
+	/* sample at 100Hz during 100ms */
+	adxl362_sample_period_write(CONFIG_CLOCK_FREQUENCY/100);
+	busy_wait(100);
+	adxl362_sample_period_write(0);
+	n = adxl362_sample_level_read();
+	for(i=0; i<n; i++) {
+		timestamp = samples[0];
+		x = samples[1];
+		y = samples[2];
+		z = samples[3]; /* pops the sample */
+		printf("%10u: x: %5d y: %5d z: %5d\n", timestamp, x, y, z);
+	}
+}
+
 static void console_service(void)
 {
 	char *str;
@@ -117,6 +147,8 @@ static void console_service(void)
 		display_test();
 	else if(strcmp(token, "led") == 0)
 		led_test();
+	else if(strcmp(token, "accel") == 0)
+		accel_test();
 	prompt();
 }
 
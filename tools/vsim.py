@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import time
+import ctypes
+import shutil
+import hashlib
+import inspect
+import argparse
+import subprocess
+
+from migen import *
+from migen.fhdl import verilog
+from migen.fhdl.structure import _Assign, _Slice, _Fragment
+from migen.fhdl.tools import list_targets, list_clock_domains
+
+# Verilator simulation backend for migen modules.
+#
+# The module is converted to Verilog with verilog.convert, compiled with Verilator
+# to a shared library and driven from Python with the same generator-style
+# testbenches as run_simulation:
+# - yield              : advance one clock cycle.
+# - yield signal       : read signal (or slice of signal).
+# - yield signal.eq(v) : write signal (applied on next clock edge, as with migen).
+#
+# Only module's ios (by default the Signals that are attributes of the module)
+# can be read/written from the testbenches (inputs are the ios not driven by the
+# module). For long runs without stimulus,
+# VerilatorSimulator.run_batch runs the clock in C and only samples the
+# requested signals.
+#
+# When Verilator is not installed, simulation falls back to migen's simulator.
+
+# Helpers ------------------------------------------------------------------------------------------
+
+def default_ios(dut):
+    return {v for k, v in vars(dut).items() if isinstance(v, Signal) and not k.startswith("_")}
+
+def get_fragment(dut):
+    return dut if isinstance(dut, _Fragment) else dut.get_fragment()
+
+def module_inputs(fragment, ios):
+    return set(ios) - list_targets(fragment)
+
+def have_verilator():
+    return shutil.which("verilator") is not None
+
+class SimStats:
+    def __init__(self, backend, cycles, duration):
+        self.backend  = backend
+        self.cycles   = cycles
+        self.duration = duration
+
+    @property
+    def cycles_per_second(self):
+        return self.cycles/self.duration if self.duration else float("inf")
+
+    def __str__(self):
+        return "{:9s}: {:10d} cycles in {:8.3f}s ({:12.1f} cycles/s)".format(
+            self.backend, self.cycles, self.duration, self.cycles_per_second)
+
+# Wrapper generation -------------------------------------------------------------------------------
+
+_wrapper_template = """
+#include <stdint.h>
+#include "Vtop.h"
+#include "verilated.h"
+
+#define SET_CLK(top, v) {set_clk}
+#define SET_RST(top, v) {set_rst}
+
+double sc_time_stamp() {{ return 0; }}
+
+extern "C" {{
+
+void *sim_create(void) {{
+    Vtop *top = new Vtop;
+    SET_CLK(top, 0);
+    SET_RST(top, 0);
+    top->eval();
+    return top;
+}}
+
+void sim_destroy(void *p) {{
+    Vtop *top = (Vtop *)p;
+    top->final();
+    delete top;
+}}
+
+void sim_eval(void *p) {{
+    ((Vtop *)p)->eval();
+}}
+
+void sim_edge(void *p, int high) {{
+    Vtop *top = (Vtop *)p;
+    SET_CLK(top, high);
+    top->eval();
+}}
+
+uint32_t sim_get(void *p, int idx, int word) {{
+    Vtop *top = (Vtop *)p;
+    switch(idx) {{
+{getters}
+    }}
+    return 0;
+}}
+
+void sim_set(void *p, int idx, int word, uint32_t value) {{
+    Vtop *top = (Vtop *)p;
+    switch(idx) {{
+{setters}
+    }}
+}}
+
+void sim_run(void *p, uint64_t cycles, int n, const int *idxs, uint64_t every, uint32_t *out) {{
+    Vtop *top = (Vtop *)p;
+    for(uint64_t i=0; i<cycles; i++) {{
+        if ((every != 0) && ((i % every) == 0)) {{
+            for(int j=0; j<n; j++)
+                *out++ = sim_get(p, idxs[j], 0);
+        }}
+        SET_CLK(top, 1);
+        top->eval();
+        SET_CLK(top, 0);
+        top->eval();
+    }}
+}}
+
+}}
+"""
+
+def _accessors(idx, name, nbits, writable):
+    if nbits <= 32:
+        get = "return top->{n};".format(n=name)
+        set = "top->{n} = value;".format(n=name)
+    elif nbits <= 64:
+        get = "return (uint32_t)(top->{n} >> (32*word));".format(n=name)
+        set = ("top->{n} = (top->{n} & ~(0xffffffffULL << (32*word))) | "
+               "((uint64_t)value << (32*word));").format(n=name)
+    else:
+        get = "return top->{n}[word];".format(n=name)
+        set = "top->{n}[word] = value;".format(n=name)
+    getter = "        case {}: {}".format(idx, get)
+    setter = "        case {}: {} break;".format(idx, set) if writable else ""
+    return getter, setter
+
+# VerilatorSimulator -------------------------------------------------------------------------------
+
+class VerilatorSimulator:
+    def __init__(self, dut, ios=None, build_dir="build_vsim", verbose=False):
+        self.ios     = default_ios(dut) if ios is None else set(ios)
+        self.verbose = verbose
+
+        # Convert to verilog
+        fragment     = get_fragment(dut)
+        self.inputs  = module_inputs(fragment, self.ios)
+        self.signals = sorted(self.ios, key=lambda s: s.duid)
+        self.index   = {s: i for i, s in enumerate(self.signals)}
+        has_clk = "sys" in list_clock_domains(fragment)
+        conv = verilog.convert(fragment, set(self.ios), name="top")
+
+        getters, setters = [], []
+        for i, s in enumerate(self.signals):
+            g, w = _accessors(i, conv.ns.get_name(s), len(s), s in self.inputs)
+            getters.append(g)
+            if w:
+                setters.append(w)
+        wrapper = _wrapper_template.format(
+            set_clk = "top->sys_clk = v;" if has_clk else "",
+            set_rst = "top->sys_rst = v;" if has_clk else "",
+            getters = "\n".join(getters),
+            setters = "\n".join(setters))
+
+        # Build (cached on verilog/wrapper hash)
+        h = hashlib.sha1((conv.main_source + wrapper).encode()).hexdigest()[:16]
+        self.build_dir = os.path.join(build_dir, h)
+        lib = os.path.join(self.build_dir, "obj", "libsim.so")
+        if not os.path.exists(lib):
+            self._build(conv, wrapper)
+        self.lib = ctypes.CDLL(os.path.abspath(lib))
+        self.lib.sim_create.restype  = ctypes.c_void_p
+        self.lib.sim_get.restype     = ctypes.c_uint32
+        self.lib.sim_get.argtypes    = [ctypes.c_void_p, ctypes.c_int, ctypes.c_int]
+        self.lib.sim_set.argtypes    = [ctypes.c_void_p, ctypes.c_int, ctypes.c_int, ctypes.c_uint32]
+        self.lib.sim_edge.argtypes   = [ctypes.c_void_p, ctypes.c_int]
+        self.lib.sim_eval.argtypes   = [ctypes.c_void_p]
+        self.lib.sim_destroy.argtypes = [ctypes.c_void_p]
+        self.lib.sim_run.argtypes    = [ctypes.c_void_p, ctypes.c_uint64, ctypes.c_int,
+            ctypes.POINTER(ctypes.c_int), ctypes.c_uint64, ctypes.POINTER(ctypes.c_uint32)]
+        self.top    = self.lib.sim_create()
+        self.cycles = 0
+
+    def _build(self, conv, wrapper):
+        os.makedirs(self.build_dir, exist_ok=True)
+        cwd = os.getcwd()
+        os.chdir(self.build_dir)
+        try:
+            conv.write("top.v")
+            with open("sim.cpp", "w") as f:
+                f.write(wrapper)
+            cmd = ["verilator", "--cc", "top.v", "sim.cpp", "--exe", "--build",
+                "-O3", "-Wno-fatal", "--Mdir", "obj", "-o", "libsim.so",
+                "-CFLAGS", "-fPIC -O2", "-LDFLAGS", "-shared"]
+            output = None if self.verbose else subprocess.DEVNULL
+            subprocess.check_call(cmd, stdout=output, stderr=output)
+        finally:
+            os.chdir(cwd)
+
+    def close(self):
+        if self.top is not None:
+            self.lib.sim_destroy(self.top)
+            self.top = None
+
+    # Signal access --------------------------------------------------------------------------------
+
+    def read(self, signal):
+        if isinstance(signal, _Slice):
+            return (self.read(signal.value) >> signal.start) & (2**(signal.stop - signal.start) - 1)
+        if signal not in self.index:
+            raise ValueError("{} is not an io of the simulated module".format(signal))
+        idx   = self.index[signal]
+        value = 0
+        for word in range((len(signal) + 31)//32):
+            value |= self.lib.sim_get(self.top, idx, word) << (32*word)
+        if signal.signed and value & (1 << (len(signal) - 1)):
+            value -= 1 << len(signal)
+        return value
+
+    def write(self, signal, value):
+        if signal not in self.inputs:
+            raise ValueError("{} is not an input of the simulated module".format(signal))
+        idx   = self.index[signal]
+        value = value & (2**len(signal) - 1)
+        for word in range((len(signal) + 31)//32):
+            self.lib.sim_set(self.top, idx, word, (value >> (32*word)) & 0xffffffff)
+
+    # Simulation -----------------------------------------------------------------------------------
+
+    def _process(self, generators, replies, passive):
+        writes    = []
+        exhausted = []
+        for generator in generators:
+            reply = replies.get(generator)
+            while True:
+                try:
+                    request = generator.send(reply)
+                except StopIteration:
+                    exhausted.append(generator)
+                    break
+                reply = None
+                if request is None:
+                    break
+                elif request == "passive":
+                    passive.add(generator)
+                elif request == "active":
+                    passive.discard(generator)
+                elif isinstance(request, _Assign):
+                    writes.append((request.l, request.r))
+                else:
+                    reply = self.read(request)
+            replies[generator] = None
+        for generator in exhausted:
+            generators.remove(generator)
+        return writes
+
+    def run(self, generators):
+        if not isinstance(generators, list):
+            generators = [generators]
+        generators = list(generators)
+        replies    = {}
+        passive    = set()
+        while generators and (set(generators) - passive):
+            writes = self._process(generators, replies, passive)
+            self.lib.sim_edge(self.top, 1)
+            for signal, value in writes:
+                value = value.value if isinstance(value, Constant) else value
+                self.write(signal, value)
+            self.lib.sim_eval(self.top)
+            self.lib.sim_edge(self.top, 0)
+            self.cycles += 1
+
+    def run_batch(self, cycles, sample=[], every=1):
+        idxs = (ctypes.c_int*len(sample))(*[self.index[s] for s in sample])
+        nsamples = (cycles + every - 1)//every if sample else 0
+        out = (ctypes.c_uint32*max(nsamples*len(sample), 1))()
+        self.lib.sim_run(self.top, cycles, len(sample), idxs, every if sample else 0, out)
+        self.cycles += cycles
+        return [tuple(out[i*len(sample):(i + 1)*len(sample)]) for i in range(nsamples)]
+
+# Run ----------------------------------------------------------------------------------------------
+
+def _counting(generator, counter):
+    reply = None
+    while True:
+        try:
+            request = generator.send(reply)
+        except StopIteration:
+            return
+        if request is None:
+            counter[0] += 1
+        reply = yield request
+
+def run(dut, generators, ios=None, backend="auto", vcd_name=None, build_dir="build_vsim", verbose=True):
+    """Run generators on dut with Verilator (if available) or migen's simulator"""
+    if backend == "auto":
+        backend = "verilator" if have_verilator() else "migen"
+    if not isinstance(generators, list):
+        generators = [generators]
+    if ios is None:
+        ios = default_ios(dut)
+
+    start = time.time()
+    if backend == "verilator":
+        sim = VerilatorSimulator(dut, ios, build_dir=build_dir)
+        start = time.time() # Exclude build time
+        sim.run(generators)
+        sim.close()
+        cycles = sim.cycles
+    else:
+        counter = [0]
+        generators = [_counting(generators[0], counter)] + generators[1:]
+        run_simulation(dut, generators, vcd_name=vcd_name)
+        cycles = counter[0]
+    stats = SimStats(backend, cycles, time.time() - start)
+    if verbose:
+        print(stats)
+    return stats
+
+# Main ---------------------------------------------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare Verilator/migen simulation speed on a module.")
+    parser.add_argument("file",                           help="Python file of the module")
+    parser.add_argument("module",                         help="Module's class name")
+    parser.add_argument("args",   nargs="*", type=float,  help="Module's arguments")
+    parser.add_argument("--cycles", default=100000, type=int, help="Number of cycles")
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(args.file)))
+    namespace = {"__name__": "vsim_module"}
+    exec(open(args.file).read(), namespace)
+    cls = namespace[args.module]
+
+    def testbench(ios, inputs):
+        # Set 1-bit inputs (tick/enable/...) and read all ios every cycle
+        for s in inputs:
+            if len(s) == 1:
+                yield s.eq(1)
+        for i in range(args.cycles):
+            for s in ios:
+                yield s
+            yield
+
+    backends = ["migen"] + (["verilator"] if have_verilator() else [])
+    for backend in backends:
+        dut      = cls(*args.args)
+        ios      = default_ios(dut)
+        fragment = dut.get_fragment()
+        inputs   = module_inputs(fragment, ios)
+        run(fragment, testbench(sorted(ios, key=lambda s: s.duid), inputs), ios=ios, backend=backend)
+
+if __name__ == "__main__":
+    main()